@@ -1,38 +1,93 @@
-from functools import partial
+from functools import lru_cache
 import chromadb
+from chromadb.config import Settings
 import gradio as gr
 from huggingface_hub import snapshot_download
 import os
-from src.faculty_advisor import gpt_4o_mini_rag
+from src.faculty_advisor import gpt_4o_mini_rag, use_vectorstore, VECTORSTORES
 
-# Step 1: Download Chroma DB from HF Hub
-local_repo_path = snapshot_download(
+# Step 1: Download Chroma DB from HF Hub, reusing the local copy when it is already there
+snapshot_kwargs = dict(
     repo_id="dawnlaker/UTH_faculty",  # <- change this
     repo_type="dataset",
     local_dir="hf_repo", 
     token=os.getenv('HF_TOKEN'),
-    allow_patterns="faculties_vectorstore/**"
 )
 
+
+def download_vectorstore(store_dir):
+    """
+    Download a Chroma store from the HF dataset, reusing the local copy when it is already there.
+    Returns the local path, or None when the dataset has no such store.
+    """
+    kwargs = dict(snapshot_kwargs, allow_patterns=f"{store_dir}/**")
+    try:
+        local_repo_path = snapshot_download(**kwargs, local_files_only=True)
+        if not os.listdir(os.path.join(local_repo_path, store_dir)):
+            raise FileNotFoundError(f"{store_dir} is empty")
+    except Exception:
+        local_repo_path = snapshot_download(**kwargs, etag_timeout=2)
+    path = os.path.join(local_repo_path, store_dir)
+    return path if os.path.isdir(path) and os.listdir(path) else None
+
+
+# Use the newest store in the dataset, so the app keeps working on the previous
+# store (and its embedding model) until a rebuilt one has been uploaded
+for store_dir in VECTORSTORES:
+    persist_path = download_vectorstore(store_dir)
+    if persist_path:
+        use_vectorstore(store_dir)
+        print(f"Using {store_dir}")
+        break
+else:
+    raise FileNotFoundError(f"None of {', '.join(VECTORSTORES)} was found in the HF dataset")
+
 # Step 2: Load the Chroma DB
 
-persist_path = os.path.join(local_repo_path, "faculties_vectorstore")
-client = chromadb.PersistentClient(path=persist_path)
-collection = client.get_or_create_collection('faculties')# <- change this
+client = chromadb.PersistentClient(
+    path=persist_path,
+    settings=Settings(anonymized_telemetry=False, allow_reset=False)
+)
+
+
+@lru_cache(maxsize=1)
+def get_collection():
+    return client.get_or_create_collection('faculties')# <- change this
+
+
+collection = get_collection()
+
 
 
 
 import gradio as gr
 MODEL = "gpt-4o-mini"
 
-chat = partial(gpt_4o_mini_rag, collection=collection)
+# Schools that can be used to filter the retrieval; "All" disables the filter
+SCHOOLS = ["All", "SPH", "SBMI", "GSBS"]
+
+# Only offer the school filter when records in the store are tagged with one of the schools.
+# ($ne would also match records without a `school` field, so match the labels explicitly.)
+has_school = bool(collection.get(where={"school": {"$in": SCHOOLS[1:]}}, limit=1, include=[])['ids'])
+
+
+async def chat(description, history, school="All"):
+    where = None if school == "All" else {"school": school}
+    async for response in gpt_4o_mini_rag(description, history, collection, where=where):
+        yield response
+
+
+examples = [
+    "I am looking for a faculty member who is an expert in epidemiology",
+    "Can you recommend someone who works on clinical trials?",
+    "Who specializes in machine learning?"
+]
 
 gr.ChatInterface(fn=chat, 
+                  type="messages",
                   title="Faculty Advisor Chat",
                     description="Ask about faculty members and their expertise",
                     theme='soft',
-                    examples=[
-                        "I am looking for a faculty member who is an expert in epidemiology",
-                        "Can you recommend someone who works on clinical trials?",
-                        "Who specializes in machine learning?"
-    ]).launch(share=True)
+                    additional_inputs=[gr.Dropdown(SCHOOLS, value="All", label="School")] if has_school else None,
+                    examples=[[example, "All"] for example in examples] if has_school else examples
+    ).launch(share=True)
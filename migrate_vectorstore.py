@@ -0,0 +1,66 @@
+"""
+Rebuild the faculty vector store with the embedding model used by
+src/faculty_advisor.py (text-embedding-3-small, 512 dimensions).
+
+Vectors from different embedding models cannot be compared, so a store built
+with text-embedding-ada-002 must be re-embedded before the chat app can query
+it. Each record is also tagged with a `school` metadata field derived from its
+profile URL, so queries can be filtered by school. The rebuilt store is written
+to VECTORSTORE_DIR, the store app.py prefers when the dataset has it; upload
+it to the HF dataset once it has been checked.
+"""
+from urllib.parse import urlparse
+import chromadb
+from tqdm import tqdm
+from src.faculty_advisor import vectorizer, VECTORSTORE_DIR
+
+SOURCE_PATH = "faculties_vectorstore"
+TARGET_PATH = VECTORSTORE_DIR
+COLLECTION_NAME = "faculties"
+BATCH_SIZE = 100
+# Profile URL domain -> school label used in the `school` metadata field;
+# subdomains such as www.sph.uth.edu map to the same school
+SCHOOL_HOSTS = {
+    "sph.uth.edu": "SPH",
+    "sbmi.uth.edu": "SBMI",
+    "gsbs.uth.edu": "GSBS",
+}
+
+
+def school_for(url):
+    host = urlparse(url or '').hostname or ''
+    for domain, school in SCHOOL_HOSTS.items():
+        if host == domain or host.endswith('.' + domain):
+            return school
+    return "Other"
+
+
+def main():
+    source = chromadb.PersistentClient(path=SOURCE_PATH).get_collection(COLLECTION_NAME)
+    data = source.get(include=['documents', 'metadatas'])
+    for metadata in data['metadatas']:
+        metadata['school'] = school_for(metadata.get('url'))
+
+    target_client = chromadb.PersistentClient(path=TARGET_PATH)
+    try:
+        target_client.delete_collection(COLLECTION_NAME)
+        print(f"Deleted existing collection: {COLLECTION_NAME}")
+    except Exception:
+        pass
+    target = target_client.create_collection(COLLECTION_NAME)
+
+    for start in tqdm(range(0, len(data['ids']), BATCH_SIZE)):
+        end = start + BATCH_SIZE
+        documents = data['documents'][start:end]
+        target.add(
+            ids=data['ids'][start:end],
+            documents=documents,
+            embeddings=vectorizer.embed_documents(documents),
+            metadatas=data['metadatas'][start:end]
+        )
+
+    print(f"Re-embedded {target.count()} documents into {TARGET_PATH}")
+
+
+if __name__ == "__main__":
+    main()
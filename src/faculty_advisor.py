@@ -1,8 +1,14 @@
 import os
+import json
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+import numpy as np
 from tqdm import tqdm
 from dotenv import load_dotenv
 import chromadb
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from langchain_openai import OpenAIEmbeddings
 
 # Initialize environment variables
@@ -10,35 +16,209 @@ load_dotenv(override=True)
 os.environ['OPENAI_API_KEY'] = os.getenv('OPENAI_API_KEY', 'your-key-if-not-using-env')
 os.environ['HF_TOKEN'] = os.getenv('HF_TOKEN', 'your-key-if-not-using-env')
 
-# Initialize OpenAI client
-openai = OpenAI()
+# Number of most recent user/assistant turns sent back to the model
+MAX_TURNS = 10
+
+# Initialize OpenAI client with a shared HTTP/2 connection pool reused across turns,
+# keeping the SDK defaults for timeouts, connection limits and redirects
+openai = AsyncOpenAI(http_client=DefaultAsyncHttpxClient(http2=True))
+
+# Chroma stores in the HF dataset, newest first, with the embedding settings each was built with;
+# queries against a store built with another model or dimension fail
+VECTORSTORES = {
+    "faculties_vectorstore_512": dict(model="text-embedding-3-small", dimensions=512),
+    "faculties_vectorstore": dict(model="text-embedding-ada-002"),
+}
+VECTORSTORE_DIR = next(iter(VECTORSTORES))
+
+
+def _make_vectorizer(store_dir):
+    return OpenAIEmbeddings(**VECTORSTORES[store_dir], openai_api_key=os.getenv('OPENAI_API_KEY'))
+
 
 # Initialize vectorizer
-vectorizer = OpenAIEmbeddings(
-    model="text-embedding-ada-002",
-    openai_api_key=os.getenv('OPENAI_API_KEY')
-)
+vectorizer = _make_vectorizer(VECTORSTORE_DIR)
+
 
+class QueryCache:
+    """
+    TTL cache for find_similars results with a semantic fallback.
 
-def find_similars(collection, description):
+    Exact hits are looked up by normalized description. On a miss, the query
+    embedding is compared against the embeddings of the most recent entries and
+    a cached result is reused when the cosine similarity exceeds the threshold.
+    """
+
+    def __init__(self, maxsize=256, ttl=300, semantic_size=64, threshold=0.97):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.semantic_size = semantic_size
+        self.threshold = threshold
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self):
+        now = time.monotonic()
+        while self._entries:
+            key, (stored_at, _, _) = next(iter(self._entries.items()))
+            if now - stored_at <= self.ttl:
+                break
+            self._entries.pop(key)
+
+    def get(self, key):
+        """Return the cached result for an exact key, or None."""
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[2]
+
+    def get_similar(self, embedding):
+        """Return the cached result whose embedding is closest to the given one, or None."""
+        with self._lock:
+            self._expire()
+            recent = list(self._entries.values())[-self.semantic_size:]
+        if not recent:
+            return None
+        matrix = np.array([e for _, e, _ in recent])
+        query = np.asarray(embedding)
+        scores = matrix @ query / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+        best = int(np.argmax(scores))
+        if scores[best] > self.threshold:
+            return recent[best][2]
+        return None
+
+    def set(self, key, embedding, value):
+        """Store a result together with the embedding it was retrieved for."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic(), embedding, value)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+# One cache per metadata filter, so results for different filters never mix
+query_caches = {}
+
+
+def _cache_for(where):
+    scope = json.dumps(where, sort_keys=True)
+    return query_caches.setdefault(scope, QueryCache())
+
+
+def _normalize(description):
+    return description.strip().lower()
+
+
+# Query embeddings keyed by normalized description, least recently used first
+EMBED_CACHE_SIZE = 512
+_embeddings = OrderedDict()
+_embeddings_lock = threading.Lock()
+
+
+def _embed(key, description):
+    """
+    Embed the description as typed, caching the vector under its normalized form
+    so retrieval matches an uncached query while repeats skip the API call.
+    """
+    with _embeddings_lock:
+        if key in _embeddings:
+            _embeddings.move_to_end(key)
+            return _embeddings[key]
+    embedding = tuple(vectorizer.embed_query(description))
+    with _embeddings_lock:
+        _embeddings[key] = embedding
+        if len(_embeddings) > EMBED_CACHE_SIZE:
+            _embeddings.popitem(last=False)
+    return embedding
+
+
+def use_vectorstore(store_dir):
+    """
+    Embed queries with the model `store_dir` was built with, dropping embeddings
+    and results cached for another store.
+    
+    Args:
+        store_dir (str): Name of the store, one of VECTORSTORES
+    """
+    global vectorizer
+    vectorizer = _make_vectorizer(store_dir)
+    with _embeddings_lock:
+        _embeddings.clear()
+    query_caches.clear()
+
+
+def find_similars(collection, description, where=None):
     """
     Find similar faculty members based on the given description.
+
+    Results are cached by normalized description, and reused for near-duplicate
+    descriptions whose embeddings are almost identical.
+    
+    Args:
+        collection: The ChromaDB collection to search in
+        description (str): The description to search for similar faculty members
+        where (dict, optional): Chroma metadata filter, e.g. {"school": "SBMI"}
+        
+    Returns:
+        tuple: (documents, names, links) containing the similar faculty members' information
+    """
+    query_cache = _cache_for(where)
+    key = _normalize(description)
+    cached = query_cache.get(key)
+    if cached is not None:
+        return cached
+
+    embedding = _embed(key, description)
+    cached = query_cache.get_similar(embedding)
+    if cached is not None:
+        return cached
+
+    return _query_similars(collection, key, embedding, where, query_cache)
+
+async def afind_similars(collection, description, where=None):
+    """
+    Async version of find_similars. The embedding request and the Chroma query
+    run in worker threads so the event loop stays free while they are in flight.
     
     Args:
         collection: The ChromaDB collection to search in
         description (str): The description to search for similar faculty members
+        where (dict, optional): Chroma metadata filter, e.g. {"school": "SBMI"}
         
     Returns:
         tuple: (documents, names, links) containing the similar faculty members' information
     """
+    query_cache = _cache_for(where)
+    key = _normalize(description)
+    cached = query_cache.get(key)
+    if cached is not None:
+        return cached
+
+    embedding = await asyncio.to_thread(_embed, key, description)
+    cached = query_cache.get_similar(embedding)
+    if cached is not None:
+        return cached
+
+    return await asyncio.to_thread(_query_similars, collection, key, embedding, where, query_cache)
+
+def _query_similars(collection, key, embedding, where, query_cache):
     results = collection.query(
-        query_embeddings=vectorizer.embed_query(description),
-        n_results=10
+        query_embeddings=list(embedding),
+        n_results=10,
+        where=where,
+        include=['documents', 'metadatas']
     )
-    documents = results['documents'][0][:]
-    name = [m['name'] for m in results['metadatas'][0][:]]
-    link = [m['url'] for m in results['metadatas'][0][:]]
-    return documents, name, link
+    documents = results['documents'][0]
+    name = []
+    link = []
+    for m in results['metadatas'][0]:
+        name.append(m['name'])
+        link.append(m['url'])
+    similars = (documents, name, link)
+    query_cache.set(key, embedding, similars)
+    return similars
 
 def make_context(similars):
     """
@@ -50,16 +230,15 @@ def make_context(similars):
     Returns:
         str: Formatted context string
     """
-    message = "To provide some context, here are some faculty members that might be relevant to your description.\n\n"
+    parts = ["To provide some context, here are some faculty members that might be relevant to your description.\n\n"]
     documents, names, links = similars
-    for similar, name, link in zip(documents, names, links):
-        message += f'''Potentially related faculty:
+    parts.extend(f'''Potentially related faculty:
 {name}
 
         website: {link}
 
-        {similar}\n\n'''
-    return message
+        {similar}\n\n''' for similar, name, link in zip(documents, names, links))
+    return "".join(parts)
 
 def messages_for(description, similars):
     """
@@ -76,36 +255,49 @@ def messages_for(description, similars):
     user_prompt += make_context(similars)
     return {"role": "user", "content": user_prompt}
 
-def gpt_4o_mini_rag(description, history, collection):
+def format_history(history):
+    """
+    Keep the most recent chat turns, in OpenAI message format.
+
+    Args:
+        history (list): Chat history as list of message dicts with "role" and "content"
+
+    Returns:
+        list: The last MAX_TURNS user/assistant message pairs
+    """
+    # Gradio messages may carry extra keys (e.g. metadata) that the OpenAI API rejects
+    return [{"role": m["role"], "content": m["content"]} for m in history[-MAX_TURNS * 2:]]
+
+async def gpt_4o_mini_rag(description, history, collection, where=None):
     """
     Generate a response using GPT-4o-mini model with RAG.
     
     Args:
         description (str): The user's description
-        history (list): Chat history as list of tuples (user_message, assistant_message)
+        history (list): Chat history as list of message dicts with "role" and "content"
         collection: The ChromaDB collection to search in
+        where (dict, optional): Chroma metadata filter applied to the retrieval
         
     Yields:
-        str: Generated response chunks
+        str: Generated response chunks, streamed asynchronously
     """
     system_message = {
         "role": "system",
         "content": "You are a academic advisor. You estimate the relevance of faculty members to a given description. Suggest relevant faculty members. Don't forget to include a link to the faculty member's profile. You should give explanation for your choice in markdown format."
     }
     
-    # Format chat history into proper message format
-    formatted_history = []
-    for user_msg, assistant_msg in history:
-        formatted_history.append({"role": "user", "content": user_msg})
-        formatted_history.append({"role": "assistant", "content": assistant_msg})
-    
-    similars = find_similars(collection=collection, description=description)
+    # Start retrieval, then yield once so the task gets to hand its embedding request to a
+    # worker thread; the history is formatted on this thread while that request is in flight
+    similars_task = asyncio.create_task(afind_similars(collection=collection, description=description, where=where))
+    await asyncio.sleep(0)
+    formatted_history = format_history(history)
+    similars = await similars_task
     current_message = messages_for(description, similars)
     
     # Combine all messages in the correct order
     messages = [system_message] + formatted_history + [current_message]
     
-    stream = openai.chat.completions.create(
+    stream = await openai.chat.completions.create(
         model="gpt-4o-mini",
         messages=messages,
         seed=42,
@@ -113,6 +305,6 @@ def gpt_4o_mini_rag(description, history, collection):
     )
     
     response = ""
-    for chunk in stream:
+    async for chunk in stream:
         response += chunk.choices[0].delta.content or ''
         yield response
@@ -1,14 +1,34 @@
-from bs4 import BeautifulSoup
-import requests
-import json
-from typing import Dict, List, Optional
+from bs4 import SoupStrainer
+import re
+import soupsieve as sv
+from typing import List, Optional
 from typing_extensions import override
 import time
-from urllib.parse import urljoin
-from faculty_scraper import FacultyScraper
+import asyncio
+from faculty_scraper import Faculty, FacultyScraper
+
+# GSBS uses <a> tags with classes "cell callout grid-x" for each faculty member
+FACULTY_SELECTOR = 'a.cell.callout.grid-x'
+NEXT_PAGE_RE = re.compile('Next Page')
+LAST_PAGE_RE = re.compile(r'^\s*Last( Page)?\s*$')
+# Page number query parameter in pagination links
+PAGE_NUMBER_RE = re.compile(r'([?&]page=)(\d+)')
+
+# Selectors applied to every faculty entry, compiled once
+NAME_SELECTOR = sv.compile('span.name strong')
+PICTURE_SELECTOR = sv.compile('div.profile__picture')
+LABELS_SELECTOR = sv.compile('span.labels')
+
+# URL inside a background / background-image style declaration
+BG_URL_RE = re.compile(r'''url\(\s*['"]?([^'")]+)''')
 
 class GSBSFacultyScraper(FacultyScraper):
     """A class to scrape faculty information from GSBS websites."""
+
+    # Faculty entries and pagination links are all <a> tags, so skip building the rest of the page
+    strainer = SoupStrainer('a')
+    # Maximum number of directory pages fetched concurrently
+    max_page_concurrency = 4
     
     def __init__(self, base_url: str = "https://gsbs.uth.edu/directory/", 
                  delay: float = 0.1, debug: bool = False):
@@ -30,8 +50,7 @@ class GSBSFacultyScraper(FacultyScraper):
         Returns:
             List: List of faculty divs
         """
-        # GSBS uses <a> tags with class "cell callout grid-x" for each faculty member
-        faculty_divs = self.soup.find_all('a', class_='cell callout grid-x')
+        faculty_divs = self.soup.select(FACULTY_SELECTOR)
         return faculty_divs
     
     @override
@@ -46,11 +65,9 @@ class GSBSFacultyScraper(FacultyScraper):
             Optional[str]: Faculty name if found, None otherwise
         """
         # GSBS stores name in <span class="name"><strong>Name</strong></span>
-        name_span = faculty_div.find('span', class_='name')
-        if name_span:
-            strong_tag = name_span.find('strong')
-            if strong_tag:
-                return strong_tag.get_text().strip()
+        strong_tag = NAME_SELECTOR.select_one(faculty_div)
+        if strong_tag:
+            return strong_tag.get_text().strip()
         return None
     
     @override
@@ -82,16 +99,13 @@ class GSBSFacultyScraper(FacultyScraper):
             Optional[str]: Image URL if found, None otherwise
         """
         # GSBS stores image in the background-style of profile__picture div
-        profile_picture_div = faculty_div.find('div', class_='profile__picture')
+        profile_picture_div = PICTURE_SELECTOR.select_one(faculty_div)
         if profile_picture_div:
             style = profile_picture_div.get('style', '')
-            if 'background:url(' in style:
-                # Extract URL from style attribute
-                start = style.find("background:url('") + len("background:url('")
-                end = style.find("')", start)
-                if start != -1 and end != -1:
-                    img_url = style[start:end]
-                    return self.get_absolute_url(self.base_url, img_url)
+            # Extract URL from style attribute
+            match = BG_URL_RE.search(style)
+            if match:
+                return self.get_absolute_url(self.base_url, match.group(1))
         return None
     
     def _extract_position(self, faculty_div) -> Optional[str]:
@@ -104,17 +118,17 @@ class GSBSFacultyScraper(FacultyScraper):
         Returns:
             Optional[str]: Position if found, None otherwise
         """
-        labels_span = faculty_div.find('span', class_='labels')
+        labels_span = LABELS_SELECTOR.select_one(faculty_div)
         if labels_span:
             return labels_span.get_text().strip()
         return None
     
-    def _get_next_page_url(self) -> Optional[str]:
+    def _get_next_link(self):
         """
-        Get the URL for the next page if pagination exists.
+        Get the "Next Page" link of the current page.
         
         Returns:
-            Optional[str]: Next page URL if found, None otherwise
+            The <a> tag of the next page link if found, None otherwise
         """
         # Look for the specific pagination structure used by GSBS
         # The next page link is in a div with class "small-4 cell" and contains an <a> with "Next Page" text
@@ -122,92 +136,173 @@ class GSBSFacultyScraper(FacultyScraper):
         
         if not next_link:
             # Alternative: look for link containing "Next Page" text
-            next_link = self.soup.find('a', string=lambda text: text and 'Next Page' in text)
+            next_link = self.soup.find('a', string=NEXT_PAGE_RE)
         
         if next_link and 'href' in next_link.attrs:
-            href = next_link['href']
-            # Convert relative URL to absolute URL
-            return self.get_absolute_url(self.base_url, href)
+            return next_link
+        return None
+
+    def _get_next_page_url(self) -> Optional[str]:
+        """
+        Get the URL for the next page if pagination exists.
         
+        Returns:
+            Optional[str]: Next page URL if found, None otherwise
+        """
+        next_link = self._get_next_link()
+        if next_link:
+            # Convert relative URL to absolute URL
+            return self.get_absolute_url(self.base_url, next_link['href'])
         return None
 
+    def _get_page_urls(self) -> List[str]:
+        """
+        Build the URLs of pages 2..N when the pagination on the first page reveals the last page N,
+        either through a "Last" link or through numbered page links other than "Next Page".
+        
+        Returns:
+            List[str]: Page URLs in order, empty if the last page is unknown
+        """
+        # Pages must be numbered from 1, so the first page links to ?page=2 as its next page
+        next_link = self._get_next_link()
+        next_match = PAGE_NUMBER_RE.search(next_link['href']) if next_link else None
+        if not next_match or int(next_match.group(2)) != 2:
+            return []
+        
+        last_link = self.soup.find('a', class_='last') or self.soup.find('a', string=LAST_PAGE_RE)
+        last_match = PAGE_NUMBER_RE.search(last_link.get('href', '')) if last_link else None
+        if last_match:
+            last_page = int(last_match.group(2))
+        else:
+            # A "Next Page" link alone only shows that page 2 exists, not where the directory ends
+            page_numbers = [
+                int(PAGE_NUMBER_RE.search(link['href']).group(2))
+                for link in self.soup.find_all('a', href=PAGE_NUMBER_RE)
+                if link is not next_link
+            ]
+            last_page = max(page_numbers, default=0)
+        
+        template = next_link['href']
+        return [
+            self.get_absolute_url(self.base_url, PAGE_NUMBER_RE.sub(rf'\g<1>{page}', template, count=1))
+            for page in range(2, last_page + 1)
+        ]
+    
+    def _extract_page_listings(self) -> List[Faculty]:
+        """
+        Extract listing information for every faculty member on the current page.
+        
+        Returns:
+            List[Faculty]: Faculty members listed on the page
+        """
+        faculty_divs = self._get_faculty_divs()
+
+        if self.debug:
+            faculty_divs = faculty_divs[:5]
+            print(f"Debug: Only scraping first 5 faculty members from first page")
+        
+        listings = []
+        for faculty_div in faculty_divs:
+            faculty_info = Faculty()
+    
+            # Extract image URL
+            image_url = self._extract_image_url(faculty_div)
+            if image_url:
+                faculty_info.image_url = image_url
+                
+            # Extract name
+            name = self._extract_name(faculty_div)
+            if name:
+                faculty_info.name = name
+            
+            # Extract position/label
+            position = self._extract_position(faculty_div)
+            if position:
+                faculty_info.position = position
+
+            # Extract profile URL
+            profile_url = self._extract_profile_url(faculty_div)
+            if profile_url:
+                faculty_info.profile_url = profile_url
+            
+            listings.append(faculty_info)
+        return listings
+
     @override
-    def scrape_faculty_list(self) -> List[Dict]:
+    def scrape_faculty_list(self) -> List[Faculty]:
         """
         Scrape faculty information from all pages of the GSBS directory.
         
+        When the first page reveals the last page number, pages 2..N are fetched
+        concurrently. "Next Page" links are then followed one by one from the
+        last fetched page until there is none, so no page is missed if the
+        pagination showed only part of the directory.
+        
         Returns:
-            List[Dict]: List of dictionaries containing faculty information
+            List[Faculty]: List of faculty members
         """
-        faculty_list = []
         current_url = self.base_url
         page_num = 1
-        
-        while current_url:
-            print(f"Scraping page {page_num}...")
+        print(f"Scraping page {page_num}...")
             
-            # Get page content
-            response = requests.get(current_url)
-            if response.status_code != 200:
-                print(f"Failed to load page {page_num}: {current_url}")
-                break
-                
-            self.soup = BeautifulSoup(response.content, 'html.parser')
-            faculty_divs = self._get_faculty_divs()
-
-            if self.debug and page_num == 1:
-                faculty_divs = faculty_divs[:5]
-                print(f"Debug: Only scraping first 5 faculty members from first page")
+        # The first page was already fetched and parsed in __init__
+        if self.response.status_code != 200:
+            print(f"Failed to load page {page_num}: {current_url}")
+            self.faculty_list = []
+            return self.faculty_list
             
-            # Process faculty on current page
-            for i, faculty_div in enumerate(faculty_divs):
-                faculty_info = {}
-
-                # Add delay between each professor
-                if len(faculty_list) > 0 or i > 0:
-                    time.sleep(self.delay)
-        
-                # Extract image URL
-                image_url = self._extract_image_url(faculty_div)
-                if image_url:
-                    faculty_info['image_url'] = image_url
-                    
-                # Extract name
-                name = self._extract_name(faculty_div)
-                if name:
-                    faculty_info['name'] = name
-                
-                # Extract position/label
-                position = self._extract_position(faculty_div)
-                if position:
-                    faculty_info['position'] = position
+        first_page_soup = self.soup
+        faculty_list = self._extract_page_listings()
+        visited = {current_url}
 
-                # Extract profile URL and get profile summary
-                profile_url = self._extract_profile_url(faculty_div)
-                if profile_url:
-                    profile = self._get_faculty_profile(profile_url)
-                    faculty_info['profile'] = profile.text
-                    faculty_info['links'] = profile.links
-                    faculty_info['profile_url'] = profile_url
-                
-                faculty_list.append(faculty_info)
-                print(f"Processed {len(faculty_list)} faculty members total")
-            
-            # Check for next page (unless in debug mode)
-            if self.debug:
-                break
-                
+        # Check for more pages (unless in debug mode)
+        page_urls = [] if self.debug else self._get_page_urls()
+        follow_next = not self.debug
+        if page_urls:
+            print(f"Scraping pages 2-{len(page_urls) + 1} concurrently...")
+            pages = asyncio.run(self._fetch_all(page_urls, self.max_page_concurrency))
+            for page_url, content in pages.items():
+                page_num += 1
+                visited.add(page_url)
+                if content is None:
+                    print(f"Failed to load page {page_num}: {page_url}")
+                    continue
+                self.soup = self._make_soup(content)
+                current_url = page_url
+                faculty_list.extend(self._extract_page_listings())
+            if pages[page_urls[-1]] is None:
+                # Without the last page there is no "Next Page" link to continue from
+                print(f"Could not check for pages after page {page_num}")
+                follow_next = False
+        if follow_next:
+            # Follow "Next Page" links from the last page scraped so far
             next_url = self._get_next_page_url()
-            if next_url and next_url != current_url:
+            while next_url and next_url not in visited:
+                visited.add(next_url)
                 current_url = next_url
                 page_num += 1
                 # Add delay between pages
                 time.sleep(self.delay * 2)
-            else:
-                current_url = None
+                print(f"Scraping page {page_num}...")
+                
+                soup = self._fetch_page(current_url)
+                if soup is None:
+                    print(f"Failed to load page {page_num}: {current_url}")
+                    break
+                
+                self.soup = soup
+                faculty_list.extend(self._extract_page_listings())
+                next_url = self._get_next_page_url()
+        
+        # Restore the first page so the scraper can be run again
+        self.soup = first_page_soup
+        
+        # Fetch and parse all profile pages
+        self._add_profiles(faculty_list)
         
         print(f"Completed scraping {page_num} page(s), total faculty: {len(faculty_list)}")
         self.faculty_list = faculty_list
+        return faculty_list
 
 
 def main():
@@ -1,23 +1,93 @@
 import os
-import time
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import contextlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import aiohttp
+from aiolimiter import AsyncLimiter
+import diskcache
+from bs4 import BeautifulSoup, SoupStrainer
 from typing import List, Dict, Optional
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 import profile_scraper as profile_scraper
-import json
+import msgspec
+
+
+def _parse_profile(url: str, html: bytes) -> Optional[Dict]:
+    """Parse one profile page in a worker process, returning None on failure."""
+    try:
+        return profile_scraper.parse_profile_html(url, html)
+    except Exception as e:
+        print(f"Error parsing profile {url}: {e}")
+        return None
+
+
+class Faculty(msgspec.Struct, omit_defaults=True):
+    """A faculty member scraped from a directory. Fields that were not found are left out of the output."""
+    image_url: Optional[str] = None
+    name: Optional[str] = None
+    position: Optional[str] = None
+    areas_of_expertise: Optional[List[str]] = None
+    profile_url: Optional[str] = None
+    profile: Optional[str] = None
+    links: Optional[Dict[str, str]] = None
 
 
 class FacultyScraper:
+    # Maximum number of profile pages fetched concurrently
+    max_concurrency = 64
+    # Maximum number of open connections to a single host
+    max_per_host = 8
+    # Restricts listing-page parsing to the relevant subtrees; None parses the whole page
+    strainer: Optional[SoupStrainer] = None
+    # Directory of the on-disk profile page cache shared across runs
+    cache_dir = '.scrape_cache'
+    # Below this many pages, parsing in-process is cheaper than starting worker processes
+    min_pool_pages = 32
+
     def __init__(self, base_url: str, delay: float = 0.1,  debug: bool = False):
         self.base_url = base_url
         self.delay = delay
         self.debug = debug
-        self.response = requests.get(self.base_url)
-        self.soup = BeautifulSoup(self.response.text, 'html.parser')
+        # Scheme and host of the directory, used to resolve root-relative URLs without urljoin
+        parsed = urlparse(base_url)
+        self._base_scheme = parsed.scheme
+        self._base_prefix = f"{parsed.scheme}://{parsed.netloc}"
+        self.cache = diskcache.Cache(self.cache_dir)
+        # Reuse connections to the directory host across pages and profiles
+        self.session = profile_scraper.SESSION
+        self.response = self.session.get(self.base_url, timeout=10)
+        self.soup = self._make_soup(self.response.content)
 
     
     
+    def _make_soup(self, markup) -> BeautifulSoup:
+        """
+        Parse a listing page, keeping only the elements matched by `strainer`.
+        
+        Args:
+            markup: HTML content of the page
+            
+        Returns:
+            BeautifulSoup: Parsed page
+        """
+        return BeautifulSoup(markup, 'lxml', parse_only=self.strainer)
+
+    def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
+        """
+        Fetch and parse a listing page with the shared session.
+        
+        Args:
+            url (str): URL of the page
+            
+        Returns:
+            Optional[BeautifulSoup]: Parsed page, None if it could not be loaded
+        """
+        response = self.session.get(url, timeout=10)
+        if response.status_code != 200:
+            return None
+        return self._make_soup(response.content)
+
     def save_to_jsonl(self, output_file: str = 'faculty_data.jsonl') -> None:
         """
         Save faculty information to a JSONL file.
@@ -29,17 +99,16 @@ class FacultyScraper:
             print("No faculty data to save. Please scrape data first.")
             return
         
-                # remove the file if it exists
-        if os.path.exists(output_file):
-            os.remove(output_file)
-            
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for faculty_member in self.faculty_list:
-                f.write(json.dumps(faculty_member, ensure_ascii=False) + '\n')
+        # Write to a temporary file and rename it, so an interrupted run never leaves a partial file
+        tmp_file = output_file + '.tmp'
+        encoder = msgspec.json.Encoder()
+        with open(tmp_file, 'wb') as f:
+            f.write(b'\n'.join(encoder.encode(faculty_member) for faculty_member in self.faculty_list) + b'\n')
+        os.replace(tmp_file, output_file)
         print(f"Saved data for {len(self.faculty_list)} faculty members to {output_file}")
 
 
-    def scrape_faculty_list(self) -> List[Dict]:
+    def scrape_faculty_list(self) -> List[Faculty]:
         """
         Scrape faculty information from the provided HTML content.
         
@@ -47,7 +116,7 @@ class FacultyScraper:
             html_content (str): HTML content containing faculty information
             
         Returns:
-            List[Dict]: List of dictionaries containing faculty information
+            List[Faculty]: List of faculty members
         """
 
         faculty_list = []
@@ -58,49 +127,170 @@ class FacultyScraper:
             faculty_divs = faculty_divs[:5]
             print(f"Debug: Only scraping first 5 faculty members")
             
-        for i, faculty_div in enumerate(faculty_divs):
-            faculty_info = {}
-
-            # Add delay between each professor
-            if i > 0:
-                time.sleep(self.delay)
+        for faculty_div in faculty_divs:
+            faculty_info = Faculty()
     
             # Extract image URL
             image_url = self._extract_image_url(faculty_div)
             if image_url:
-                faculty_info['image_url'] = image_url
+                faculty_info.image_url = image_url
             # Extract name and profile information
             name = self._extract_name(faculty_div)
             if name:
-                faculty_info['name'] = name
+                faculty_info.name = name
 
             profile_url = self._extract_profile_url(faculty_div)
             if profile_url:
-                profile = self._get_faculty_profile(profile_url)
-                faculty_info['profile'] = profile.text
-                faculty_info['links'] = profile.links
-                faculty_info['profile_url'] = profile_url
+                faculty_info.profile_url = profile_url
             
             faculty_list.append(faculty_info)
-            print(f"Processed {i+1}/{len(faculty_divs)} faculty members")
+
+        self._add_profiles(faculty_list)
         
         self.faculty_list = faculty_list
+        return faculty_list
+            
+    def summarize_profiles(self, concurrency: int = 20, batch: bool = False) -> None:
+        """
+        Replace each scraped profile text with an LLM-processed version.
+        Requests to the OpenAI API run concurrently, or through the Batch API
+        for bulk runs where waiting for the results is acceptable.
+        
+        Args:
+            concurrency (int): Maximum number of summarization requests in flight
+            batch (bool): Submit all profiles as one OpenAI batch job instead
+        """
+        # Imported here so scraping does not require the summarize module or an API key
+        from summarize import summarize_all, summarize_batch
+
+        entries = [info for info in self.faculty_list if info.profile]
+        texts = [info.profile for info in entries]
+        if batch:
+            summaries = summarize_batch(texts)
+        else:
+            summaries = asyncio.run(summarize_all(texts, concurrency))
+        for faculty_info, summary in zip(entries, summaries):
+            if summary:
+                faculty_info.profile = summary
+        print(f"Summarized {sum(1 for s in summaries if s)}/{len(entries)} profiles")
+
+    def _add_profiles(self, faculty_list: List[Faculty]) -> None:
+        """
+        Fetch and parse the profile page of every faculty member that has a
+        profile URL, setting `profile` and `links` on their entry in place.
+        
+        Args:
+            faculty_list (List[Faculty]): Faculty entries extracted from the listing
+        """
+        # Fetch all profile pages concurrently
+        profile_urls = [info.profile_url for info in faculty_list if info.profile_url]
+        pages = asyncio.run(self._fetch_profiles(profile_urls))
+        profiles = self._parse_profiles(pages)
+
+        for i, faculty_info in enumerate(faculty_list):
+            profile = profiles.get(faculty_info.profile_url)
+            if profile:
+                faculty_info.profile = profile['content']
+                faculty_info.links = profile['links']
+            print(f"Processed {i+1}/{len(faculty_list)} faculty members")
+
+    def _parse_profiles(self, pages: Dict[str, Optional[bytes]]) -> Dict[str, Optional[Dict]]:
+        """
+        Parse fetched profile pages in a process pool, since parsing is CPU-bound.
+        Small batches, such as debug runs, are parsed in-process instead.
+        
+        Args:
+            pages (Dict[str, Optional[bytes]]): Mapping of URL to page content
+            
+        Returns:
+            Dict[str, Optional[Dict]]: Mapping of URL to parsed profile, None on failure
+        """
+        fetched = [(url, html) for url, html in pages.items() if html is not None]
+        if not fetched:
+            return {}
+        urls, htmls = zip(*fetched)
+        if len(urls) < self.min_pool_pages:
+            profiles = list(map(_parse_profile, urls, htmls))
+        else:
+            with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(urls))) as executor:
+                profiles = list(executor.map(_parse_profile, urls, htmls, chunksize=8))
+        return dict(zip(urls, profiles))
+
+    async def _fetch(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, limiters, url: str) -> Optional[bytes]:
+        """
+        Fetch a single page, holding the semaphore for the duration of the request.
+        Pages are stored in the on-disk cache together with their ETag/Last-Modified
+        validators, and served from the cache when the server answers 304.
+        
+        Args:
+            session (aiohttp.ClientSession): Shared HTTP session
+            semaphore (asyncio.Semaphore): Limits the number of concurrent requests
+            limiters: Mapping of host to an async context manager that paces request starts
+            url (str): URL of the page
+            
+        Returns:
+            Optional[bytes]: Page content, None on failure
+        """
+        cached = self.cache.get(url)
+        request_headers = dict(profile_scraper.headers)
+        if cached:
+            if cached['etag']:
+                request_headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                request_headers['If-Modified-Since'] = cached['last_modified']
+
+        async with semaphore, limiters[urlparse(url).netloc]:
+            try:
+                async with session.get(url, headers=request_headers) as response:
+                    if response.status == 304 and cached:
+                        return cached['content']
+                    response.raise_for_status()
+                    content = await response.read()
+                    self.cache.set(url, {
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'content': content
+                    })
+                    return content
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                print(f"Error fetching {url}: {e}")
+                return None
+
+    async def _fetch_profiles(self, urls: List[str]) -> Dict[str, Optional[bytes]]:
+        """
+        Fetch profile pages concurrently.
+        
+        Args:
+            urls (List[str]): Profile URLs to fetch
             
-    def _get_faculty_profile(self, profile_url: str) -> str:
+        Returns:
+            Dict[str, Optional[bytes]]: Mapping of URL to page content
+        """
+        return await self._fetch_all(urls, self.max_concurrency)
+
+    async def _fetch_all(self, urls: List[str], max_concurrency: int) -> Dict[str, Optional[bytes]]:
         """
-        Get faculty profile summary using the summarize function.
+        Fetch pages concurrently, with at most `max_concurrency` requests in flight.
         
         Args:
-            profile_url (str): URL of the faculty profile
+            urls (List[str]): URLs to fetch
+            max_concurrency (int): Maximum number of concurrent requests
             
         Returns:
-            str: Profile summary
+            Dict[str, Optional[bytes]]: Mapping of URL to page content, in request order
         """
-        try:
-            return profile_scraper.FacultyProfileScraper(profile_url)
-        except Exception as e:
-            print(f"Error summarizing profile {profile_url}: {e}")
-            return f"Error: Could not summarize profile"
+        urls = list(dict.fromkeys(urls))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        # Start at most one request every `delay` seconds per host to stay polite,
+        # while requests to different hosts proceed independently
+        if self.delay > 0:
+            limiters = defaultdict(lambda: AsyncLimiter(1, self.delay))
+        else:
+            limiters = defaultdict(contextlib.nullcontext)
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_per_host)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            pages = await asyncio.gather(*[self._fetch(session, semaphore, limiters, url) for url in urls])
+        return dict(zip(urls, pages))
         
     
 
@@ -137,4 +327,12 @@ class FacultyScraper:
         Returns:
             str: The absolute URL
         """
+        # Fast paths for the common absolute and root-relative forms on the directory's own host
+        if relative_url.startswith(('http://', 'https://')):
+            return relative_url
+        if base_url == self.base_url:
+            if relative_url.startswith('//'):
+                return f"{self._base_scheme}:{relative_url}"
+            if relative_url.startswith('/'):
+                return self._base_prefix + relative_url
         return urljoin(base_url, relative_url)
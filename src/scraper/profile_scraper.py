@@ -1,111 +1,175 @@
+import os
+import pickle
+import hashlib
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 
 # Headers for web scraping
 headers = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36"
 }
 
-class FacultyProfileScraper:
-    def __init__(self, url):
-        """
-        Create this FacultyProfileScraper object from the given URL, 
-        specifically designed for faculty directory pages
-        """
-        self.url = url
-        self.response = requests.get(url, headers=headers)
-        self.soup = BeautifulSoup(self.response.content, 'html.parser')
-        
-        # Extract title
-        self.title = self.soup.title.string if self.soup.title else "No title found"
-        
-        # Remove irrelevant elements
-        self._remove_irrelevant_content(self.soup)
-        
-        self.text = self.soup.body.get_text(separator="\n", strip=True) if self.soup.body else "No content found"
-        
-        # Clean up extra whitespace and empty lines
-        self.text = self._clean_text(self.text)
+# Directory holding parsed profiles, keyed by a hash of the profile URL
+PROFILE_CACHE_DIR = os.path.join('.cache', 'profiles')
+# Part of every cached profile's digest. Bump it whenever parse_profile_html
+# produces different output, so profiles parsed by older code are not reused
+PARSER_VERSION = '3'
+
+# Tags that never carry profile content (scripts, styles, images, page chrome)
+IRRELEVANT_TAGS = {"script", "style", "img", "input", "noscript", "header", "nav", "footer"}
+
+# Elements with navigation-related classes/ids, plus common unnecessary elements,
+# combined into one selector so the tree is walked once
+IRRELEVANT_SELECTOR = ', '.join([
+    'div[id*="nav"]', 'div[class*="nav"]', 'div[class*="menu"]',
+    'div[id*="utility"]', 'div[class*="utility"]',
+    'div[id*="masthead"]', 'div[class*="masthead"]',
+    'ul[class*="menu"]', 'li[class*="mega-menu"]',
+    '.skipNav', '.show-for-sr', '.hide', '.hidden',
+    '[data-toggle]', '[data-reveal]', '[data-dropdown]'
+])
 
-        self.links = self._extract_links(self.soup)
+# Kinds of links extracted from a profile page
+LINK_KINDS = {'pubmed', 'google scholar', 'website'}
+
+# Shared session so requests to the same host reuse their TCP/TLS connection.
+# Listing pages are always fetched fresh; profile pages are cached by FacultyScraper._fetch.
+SESSION = requests.Session()
+SESSION.headers.update(headers)
+# Advertise every compression scheme urllib3 can decode (gzip, deflate, and br when brotli is installed)
+SESSION.headers.update(make_headers(accept_encoding=True))
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+def parse_profile_html(url, html):
+    """
+    Parse a faculty profile page.
     
-    def _remove_irrelevant_content(self, soup):
-        """
-        Remove navigation, footer, scripts, styles, and other irrelevant content
-        """
-        # Remove all script, style, img, input elements
-        for element in soup(["script", "style", "img", "input", "noscript"]):
-            element.decompose()
-        
-        # Remove header/navigation (usually contains masthead, navigation menus)
-        for header in soup.find_all(['header', 'nav']):
-            header.decompose()
-        
-        # Remove footer
-        for footer in soup.find_all('footer'):
-            footer.decompose()
-        
-        # Remove elements with navigation-related classes/ids
-        nav_selectors = [
-            'div[id*="nav"]', 'div[class*="nav"]', 'div[class*="menu"]',
-            'div[id*="utility"]', 'div[class*="utility"]',
-            'div[id*="masthead"]', 'div[class*="masthead"]',
-            'ul[class*="menu"]', 'li[class*="mega-menu"]'
-        ]
-        
-        for selector in nav_selectors:
-            for element in soup.select(selector):
-                element.decompose()
-        
-        # Remove common unnecessary elements by class or id
-        unnecessary_selectors = [
-            '.skipNav', '.show-for-sr', '.hide', '.hidden',
-            '[data-toggle]', '[data-reveal]', '[data-dropdown]'
-        ]
-        
-        for selector in unnecessary_selectors:
-            for element in soup.select(selector):
-                element.decompose()
+    This is a top-level function so it can be pickled and run in a process pool.
+    Parsed results are cached on disk and reused while the page content and PARSER_VERSION are unchanged.
     
-    def _clean_text(self, text):
-        """
-        Clean up the extracted text by removing extra whitespace and empty lines
-        """
-        lines = text.split('\n')
-        cleaned_lines = []
-        
-        for line in lines:
-            cleaned_line = line.strip()
-            if cleaned_line:  # Only add non-empty lines
-                cleaned_lines.append(cleaned_line)
+    Args:
+        url (str): URL of the profile page
+        html (bytes | str): HTML content of the profile page
         
-        return '\n'.join(cleaned_lines)
+    Returns:
+        Dict: Profile information with 'url', 'title', 'content' and 'links'
+    """
+    # Reuse the parsed result from a previous run if the page has not changed
+    cache_path = os.path.join(PROFILE_CACHE_DIR, hashlib.blake2b(url.encode()).hexdigest() + '.pkl')
+    digest = hashlib.blake2b(html.encode() if isinstance(html, str) else html,
+                             person=PARSER_VERSION.encode()).hexdigest()
+    cached = _load_cached(cache_path, digest)
+    if cached:
+        return {'url': url, 'title': cached['title'], 'content': cached['text'], 'links': cached['links']}
     
-    def _extract_links(self, soup):
-        """
-        Extract PubMed and website links from the profile page.
+    tree = LexborHTMLParser(html)
+    
+    # Extract title
+    title_node = tree.css_first('title')
+    title = title_node.text() if title_node and title_node.text() else "No title found"
+    
+    # Remove irrelevant elements
+    _remove_irrelevant_content(tree)
+    
+    # Strip every line and drop empty ones while joining, in a single pass
+    if tree.body:
+        text = '\n'.join(filter(None, map(str.strip, tree.body.text(separator="\n").split('\n'))))
+    else:
+        text = "No content found"
+
+    links = _extract_links(tree)
+    _save_cached(cache_path, {'digest': digest, 'title': title, 'text': text, 'links': links})
+    return {'url': url, 'title': title, 'content': text, 'links': links}
+
+def _load_cached(cache_path, digest):
+    """
+    Load a parsed profile from the cache.
+    Returns None unless a cached entry for the same page content and parser version was found.
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if cached.get('digest') != digest:
+        return None
+    return cached
+
+def _save_cached(cache_path, entry):
+    """
+    Store a parsed profile in the cache.
+    """
+    os.makedirs(PROFILE_CACHE_DIR, exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        pickle.dump(entry, f)
+
+def _remove_irrelevant_content(tree):
+    """
+    Remove navigation, footer, scripts, styles, and other irrelevant content
+    """
+    # Remove script, style, img, input elements and header/navigation/footer in one pass
+    tree.strip_tags(list(IRRELEVANT_TAGS))
+    
+    # Remove elements with navigation-related classes/ids and other unnecessary elements
+    for element in tree.css(IRRELEVANT_SELECTOR):
+        element.decompose()
+
+def _extract_links(tree):
+    """
+    Extract PubMed and website links from the profile page.
+    The first matching link of each kind is kept, and the scan stops once all are found.
+    
+    Returns:
+        Dict: Dictionary containing PubMed and website links
+    """
+    links = {}
+    
+    # Find all links that actually point somewhere
+    for link in tree.css('a[href]'):
+        if LINK_KINDS <= links.keys():
+            break
+        href = link.attributes.get('href') or ''
+        href_lower = href.lower()
+        label = ((link.attributes.get('title') or '') + ' ' + link.text()).lower()
         
-        Returns:
-            Dict: Dictionary containing PubMed and website links
+        # Check for PubMed link
+        if 'pubmed' in href_lower or 'pubmed' in label:
+            links.setdefault('pubmed', href)
+        elif 'google scholar' in href_lower or 'google scholar' in label:
+            links.setdefault('google scholar', href)
+        # Check for website link
+        elif 'website' in label:
+            links.setdefault('website', href)
+            
+    return links
+
+class FacultyProfileScraper:
+    def __init__(self, url, html=None, session=None):
+        """
+        Create this FacultyProfileScraper object from the given URL, 
+        specifically designed for faculty directory pages.
+        If the page HTML has already been fetched, pass it as `html`
+        to skip the request. Requests go through the shared SESSION unless
+        another `requests.Session` is passed.
         """
-        links = {}
+        self.url = url
+        if html is None:
+            self.response = (session or SESSION).get(url, timeout=10)
+            html = self.response.content
         
-        # Find all links
-        for link in soup.find_all('a'):
-            href = link.get('href', '')
-            title = link.get('title', '').lower()
-            text = link.get_text().strip().lower()
-            
-            # Check for PubMed link
-            if 'pubmed' in href.lower() or 'pubmed' in title or 'pubmed' in text:
-                links['pubmed'] = href
-            if 'google scholar' in href.lower() or 'google scholar' in title or 'google scholar' in text:
-                links['google scholar'] = href
-            # Check for website link
-            elif 'website' in title or 'website' in text:
-                links['website'] = href
-                
-        return links
+        profile_info = parse_profile_html(url, html)
+        self.title = profile_info['title']
+        self.text = profile_info['content']
+        self.links = profile_info['links']
     
     def get_profile_info(self):
         """
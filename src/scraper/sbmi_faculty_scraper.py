@@ -1,15 +1,36 @@
-from bs4 import BeautifulSoup
-import requests
-import json
-from typing import Dict, List, Optional
+import argparse
+from bs4 import SoupStrainer
+import re
+import soupsieve as sv
+from typing import List, Optional
 from typing_extensions import override
-import time
-from urllib.parse import urljoin
-from summarize import summarize
-from src.scraper.faculty_scraper import FacultyScraper
+from src.scraper.faculty_scraper import Faculty, FacultyScraper
+
+# onclick handlers that navigate to a faculty profile, used to strain the page while parsing
+FACULTY_ONCLICK_RE = re.compile(r"window\.location.*faculty-and-staff")
+
+# Expertise section of a faculty card, up to the "click for full bio" link
+EXPERTISE_RE = re.compile(r'Areas of Expertise(.*?)(?:click for full bio|\Z)', re.S)
+
+# Faculty divs whose onclick navigates to a profile
+FACULTY_SELECTOR = sv.compile('div[onclick*="window.location"][onclick*="faculty-and-staff"]')
+
+# Selectors applied to every faculty div, compiled once
+NAME_SELECTOR = sv.compile('.fac-nam strong')
+POSITION_SELECTOR = sv.compile('.fac-nam + em')
+IMAGE_SELECTOR = sv.compile('.photo img')
 
 class SBMIFacultyScraper(FacultyScraper):
     """A class to scrape faculty information from SBMI websites."""
+
+    # Only the clickable faculty cards are needed, so skip building the rest of the page
+    strainer = SoupStrainer('div', attrs={'onclick': FACULTY_ONCLICK_RE})
+
+    # Common academic titles and degrees, longest alternatives first
+    _TITLE_RE = re.compile(
+        r'\b(?:Assistant Professor|Associate Professor|Professor|Prof\.|Lecturer|'
+        r'Emeritus|Chair|Director|Dean|Ph\.D\.|PhD|M\.D\.|MD|Dr\.)(?!\w)'
+    )
     
     def __init__(self, base_url: str = "https://sbmi.uth.edu/faculty/", 
                  delay: float = 0.1, debug: bool = False):
@@ -32,10 +53,10 @@ class SBMIFacultyScraper(FacultyScraper):
             List: List of faculty divs
         """
         # Look for divs with onclick attributes that contain faculty URLs
-        faculty_divs = self.soup.find_all('div', attrs={'onclick': lambda x: x and 'window.location' in x and 'faculty-and-staff' in x})
+        faculty_divs = FACULTY_SELECTOR.select(self.soup)
         
-        # Filter out empty or invalid divs
-        return [div for div in faculty_divs if div and div.get_text().strip()]
+        # Filter out empty divs
+        return [div for div in faculty_divs if div.get_text(strip=True)]
     
     @override
     def _extract_name(self, faculty_div) -> Optional[str]:
@@ -49,7 +70,7 @@ class SBMIFacultyScraper(FacultyScraper):
             Optional[str]: Faculty name if found, None otherwise
         """
         # Look for the name in the fac-nam span
-        name_element = faculty_div.select_one('.fac-nam strong')
+        name_element = NAME_SELECTOR.select_one(faculty_div)
         if name_element:
             name = name_element.get_text().strip()
             # Clean up common title patterns and suffixes
@@ -65,22 +86,13 @@ class SBMIFacultyScraper(FacultyScraper):
             return ""
         
         # Remove common titles and suffixes
-        name = name.split(',')[0]  # Remove everything after comma
+        name = name.split(',', 1)[0]  # Remove everything after comma
         
         # Remove common academic titles and degrees
-        remove_patterns = [
-            'PhD', 'MD', 'Ph.D.', 'M.D.', 'Dr.', 'Professor', 'Prof.',
-            'Assistant Professor', 'Associate Professor', 'Lecturer',
-            'Emeritus', 'Chair', 'Director', 'Dean'
-        ]
-        
-        for pattern in remove_patterns:
-            name = name.replace(pattern, '').strip()
+        name = self._TITLE_RE.sub('', name)
         
         # Clean up extra whitespace
-        name = ' '.join(name.split())
-        
-        return name.strip()
+        return ' '.join(name.split())
     
     def _extract_areas_of_expertise(self, faculty_div) -> List[str]:
         """
@@ -92,17 +104,12 @@ class SBMIFacultyScraper(FacultyScraper):
         Returns:
             List[str]: List of areas of expertise
         """
-        areas = []
         # Look for text after "Areas of Expertise" and before "click for full bio"
-        text_content = faculty_div.get_text()
-        if "Areas of Expertise" in text_content:
-            expertise_section = text_content.split("Areas of Expertise")[1].split("click for full bio")[0]
-            # Split by "»" and clean up each area
-            for line in expertise_section.split("»"):
-                area = line.strip()
-                if area and not area.startswith("click for full bio"):
-                    areas.append(area.strip())
-        return areas
+        match = EXPERTISE_RE.search(faculty_div.get_text())
+        if not match:
+            return []
+        # Split by "»" and clean up each area
+        return [area for area in (line.strip() for line in match.group(1).split("»")) if area]
     
     @override
     def _extract_position(self, faculty_div) -> Optional[str]:
@@ -116,7 +123,7 @@ class SBMIFacultyScraper(FacultyScraper):
             Optional[str]: Position if found, None otherwise
         """
         # Look for the position in the em tag after the name
-        position_element = faculty_div.select_one('.fac-nam + em')
+        position_element = POSITION_SELECTOR.select_one(faculty_div)
         if position_element:
             return position_element.get_text().strip()
                 
@@ -158,7 +165,7 @@ class SBMIFacultyScraper(FacultyScraper):
             Optional[str]: Image URL if found, None otherwise
         """
         # Look for img tag within the photo div
-        img_tag = faculty_div.select_one('.photo img')
+        img_tag = IMAGE_SELECTOR.select_one(faculty_div)
         if img_tag:
             src = img_tag.get('src')
             if src and not any(placeholder in src.lower() for placeholder in 
@@ -168,24 +175,22 @@ class SBMIFacultyScraper(FacultyScraper):
         return None
     
     @override
-    def scrape_faculty_list(self) -> List[Dict]:
+    def scrape_faculty_list(self) -> List[Faculty]:
         """
         Scrape faculty information from the SBMI directory (single page).
         
         Returns:
-            List[Dict]: List of dictionaries containing faculty information
+            List[Faculty]: List of faculty members
         """
         faculty_list = []
         
         print(f"Scraping faculty from: {self.base_url}")
         
-        # Get page content
-        response = requests.get(self.base_url)
-        if response.status_code != 200:
+        # The page was already fetched and parsed in __init__
+        if self.response.status_code != 200:
             print(f"Failed to load page: {self.base_url}")
             return faculty_list
             
-        self.soup = BeautifulSoup(response.content, 'html.parser')
         faculty_divs = self._get_faculty_divs()
         
         print(f"Found {len(faculty_divs)} potential faculty elements")
@@ -194,51 +199,45 @@ class SBMIFacultyScraper(FacultyScraper):
             faculty_divs = faculty_divs[:5]
             print(f"Debug mode: Processing only first 5 faculty members")
         
-        # Process each faculty member
+        # Extract listing information for each faculty member
+        listings = []
         for i, faculty_div in enumerate(faculty_divs):
-            faculty_info = {}
-
-            # Add delay between each professor
-            if i > 0:
-                time.sleep(self.delay)
+            faculty_info = Faculty()
     
             # Extract image URL
             image_url = self._extract_image_url(faculty_div)
             if image_url:
-                faculty_info['image_url'] = image_url
+                faculty_info.image_url = image_url
                 
             # Extract name
             name = self._extract_name(faculty_div)
             if name:
-                faculty_info['name'] = name
+                faculty_info.name = name
             
             # Extract position/title
             position = self._extract_position(faculty_div)
             if position:
-                faculty_info['position'] = position
+                faculty_info.position = position
 
             # Extract areas of expertise
             areas = self._extract_areas_of_expertise(faculty_div)
             if areas:
-                faculty_info['areas_of_expertise'] = areas
+                faculty_info.areas_of_expertise = areas
 
-            # Extract profile URL and get profile summary
+            # Extract profile URL
             profile_url = self._extract_profile_url(faculty_div)
             if profile_url:
-                try:
-                    profile_summary = self._get_faculty_profile(profile_url)
-                    faculty_info['profile'] = profile_summary
-                    faculty_info['profile_url'] = profile_url
-                except Exception as e:
-                    print(f"Error getting profile for {name}: {e}")
-                    faculty_info['profile_url'] = profile_url
+                faculty_info.profile_url = profile_url
             
             # Only add faculty with at least a name
-            if faculty_info.get('name'):
-                faculty_list.append(faculty_info)
-                print(f"Processed: {faculty_info['name']} ({len(faculty_list)} total)")
+            if faculty_info.name:
+                listings.append(faculty_info)
             else:
                 print(f"Skipped faculty div {i+1} - no name found")
+
+        # Fetch and parse all profile pages
+        self._add_profiles(listings)
+        faculty_list.extend(listings)
         
         print(f"Completed scraping, total faculty: {len(faculty_list)}")
         self.faculty_list = faculty_list
@@ -247,11 +246,19 @@ class SBMIFacultyScraper(FacultyScraper):
 
 def main():
     """Main function to run the SBMI faculty scraper."""
+    parser = argparse.ArgumentParser(description='Scrape the SBMI faculty directory')
+    parser.add_argument('--summarize', action='store_true',
+                        help='Clean up the profile texts with gpt-4o-mini before saving')
+    parser.add_argument('--batch', action='store_true',
+                        help='Summarize through the OpenAI Batch API instead (slower, cheaper)')
+    args = parser.parse_args()
     base_url = 'https://sbmi.uth.edu/faculty-and-staff/'
     
     # Create scraper instance and run
     scraper = SBMIFacultyScraper(base_url, debug=False)
     faculty_list = scraper.scrape_faculty_list()
+    if args.summarize or args.batch:
+        scraper.summarize_profiles(batch=args.batch)
     file_name = 'data/sbmi_faculty_list.jsonl'
     # Save the faculty list as jsonl file
     scraper.save_to_jsonl(file_name)
@@ -1,15 +1,14 @@
-from bs4 import BeautifulSoup
-import requests
-import json
+import argparse
+from bs4 import SoupStrainer
 from typing import Dict, List, Optional
 from typing_extensions import override
-import time
-from urllib.parse import urljoin
-from summarize import summarize
 from src.scraper.faculty_scraper import FacultyScraper
 
 class SPHFacultyScraper(FacultyScraper):
     """A class to scrape faculty information from SPH websites."""
+
+    # Only the faculty cards are needed, so skip building the rest of the page
+    strainer = SoupStrainer('div', class_='cell fac-sort')
     
     def __init__(self, base_url: str, delay: float = 0.1,
                   debug: bool = False):
@@ -95,11 +94,19 @@ class SPHFacultyScraper(FacultyScraper):
 
 def main():
     """Main function to run the faculty scraper."""
+    parser = argparse.ArgumentParser(description='Scrape the SPH faculty directory')
+    parser.add_argument('--summarize', action='store_true',
+                        help='Clean up the profile texts with gpt-4o-mini before saving')
+    parser.add_argument('--batch', action='store_true',
+                        help='Summarize through the OpenAI Batch API instead (slower, cheaper)')
+    args = parser.parse_args()
     base_url = 'https://sph.uth.edu/faculty/'
     
     # Create scraper instance and run
     scraper = SPHFacultyScraper(base_url, debug=False)
     scraper.scrape_faculty_list()
+    if args.summarize or args.batch:
+        scraper.summarize_profiles(batch=args.batch)
     scraper.save_to_jsonl('data/sph_faculty_list.jsonl')
 
 
@@ -1,18 +1,24 @@
 # imports
 
 import os
-import requests
+import json
+import time
+import random
+import asyncio
+import functools
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from IPython.display import Markdown, display
-from openai import OpenAI
-import src.scraper.profile_scraper as profile_scraper
+from openai import OpenAI, AsyncOpenAI, RateLimitError
 # Load environment variables in a file called .env
 
 load_dotenv(override=True)
 api_key = os.getenv('OPENAI_API_KEY')
 
-openai = OpenAI()
+# The client is created on first use, so importing this module does not build it.
+# Async clients are created per event loop in summarize_all instead.
+
+@functools.cache
+def _client():
+    return OpenAI()
 
 # Check the key
 
@@ -55,7 +61,7 @@ def remove_prefix_and_suffix(text):
 # And now: call the OpenAI API. You will get very familiar with this!
 
 def summarize(website):
-    response = openai.chat.completions.create(
+    response = _client().chat.completions.create(
         model = "gpt-4o-mini",
         messages = messages_for(website)
     )
@@ -63,4 +69,97 @@ def summarize(website):
 
     return response.choices[0].message.content
 
-
+async def summarize_async(client, website, sem, max_retries=5):
+    """
+    Async version of summarize using the given AsyncOpenAI client. Waits on `sem`
+    so only a bounded number of requests are in flight, and backs off and retries
+    when rate limited.
+    """
+    async with sem:
+        for attempt in range(max_retries):
+            try:
+                response = await client.chat.completions.create(
+                    model = "gpt-4o-mini",
+                    messages = messages_for(website)
+                )
+                return response.choices[0].message.content
+            except RateLimitError as e:
+                if attempt == max_retries - 1:
+                    raise
+                await asyncio.sleep(_retry_delay(e.response.headers.get('retry-after'), attempt))
+
+def _retry_delay(retry_after, attempt):
+    """
+    Seconds to wait before retrying: the server's Retry-After hint when it is a number
+    of seconds, else (missing or an HTTP date) exponential backoff with jitter.
+    """
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return 2 ** attempt + random.random()
+
+async def summarize_all(websites, concurrency=20):
+    """
+    Summarize many websites concurrently. Results are returned in input order;
+    websites that could not be summarized get None.
+    """
+    sem = asyncio.Semaphore(concurrency)
+    # The client's connections belong to the running event loop, so it is closed with it
+    async with AsyncOpenAI() as client:
+        results = await asyncio.gather(*(summarize_async(client, w, sem) for w in websites), return_exceptions=True)
+    summaries = []
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Error summarizing website: {result}")
+            summaries.append(None)
+        else:
+            summaries.append(result)
+    return summaries
+
+def summarize_batch(websites, poll_interval=60):
+    """
+    Summarize many websites through the OpenAI Batch API. Meant for bulk,
+    non-interactive runs: requests are processed asynchronously on OpenAI's side
+    (within 24h) at lower cost and without per-request rate limits.
+    Results are returned in input order; websites that failed get None.
+    """
+    if not websites:
+        return []
+    rows = [
+        {
+            "custom_id": f"faculty-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {"model": "gpt-4o-mini", "messages": messages_for(website)}
+        }
+        for i, website in enumerate(websites)
+    ]
+    payload = "\n".join(json.dumps(row, ensure_ascii=False) for row in rows).encode("utf-8")
+    openai = _client()
+    input_file = openai.files.create(file=("batch_input.jsonl", payload), purpose="batch")
+    batch = openai.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"Submitted batch {batch.id} with {len(rows)} requests")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = openai.batches.retrieve(batch.id)
+        counts = batch.request_counts  # not reported while the batch is still validating
+        progress = f" ({counts.completed}/{counts.total})" if counts else ""
+        print(f"Batch {batch.id}: {batch.status}{progress}")
+
+    summaries = [None] * len(websites)
+    if not batch.output_file_id:
+        print(f"Batch {batch.id} finished with status {batch.status} and no output")
+        return summaries
+
+    for line in openai.files.content(batch.output_file_id).text.splitlines():
+        result = json.loads(line)
+        response = result.get("response")
+        if response and response["status_code"] == 200:
+            index = int(result["custom_id"].rsplit("-", 1)[1])
+            summaries[index] = response["body"]["choices"][0]["message"]["content"]
+    return summaries
@@ -1,5 +1,7 @@
+import functools
 from langchain.vectorstores import Chroma
 from langchain.embeddings import OpenAIEmbeddings
+from langchain.embeddings.base import Embeddings
 from langchain.chat_models import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
 from langchain.chains import ConversationalRetrievalChain
@@ -14,15 +16,33 @@ class StreamingCallbackHandler(BaseCallbackHandler):
         self.current_response += token
         print(token, end="", flush=True)
 
+class CachedQueryEmbeddings(Embeddings):
+    """
+    OpenAIEmbeddings with query embeddings cached, so repeated questions skip the API call
+    """
+    def __init__(self):
+        self.embeddings = OpenAIEmbeddings()
+        self._embed_query = functools.lru_cache(maxsize=1024)(self._embed_query_uncached)
+
+    def _embed_query_uncached(self, text):
+        return tuple(self.embeddings.embed_query(text))
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        return list(self._embed_query(text))
+
 def setup_chat():
     # Initialize vectorstore
     vectorstore = Chroma(
         persist_directory="faculties_vectorstore",
-        embedding_function=OpenAIEmbeddings()
+        embedding_function=CachedQueryEmbeddings()
     )
 
-    # Create retriever
-    retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
+    # Create retriever; MMR picks 5 diverse profiles out of the 20 nearest, reusing
+    # the query embedding for both steps so each question is embedded once
+    retriever = vectorstore.as_retriever(search_type="mmr", search_kwargs={"k": 5, "fetch_k": 20})
 
     # Initialize LLM with streaming enabled
     llm = ChatOpenAI(
@@ -47,12 +67,23 @@ def setup_chat():
 
     return conversation_chain
 
+_chain = None
+
+def get_chain():
+    """
+    Return the conversation chain, building it on first use so the vectorstore,
+    embedding client and conversation memory are shared across queries
+    """
+    global _chain
+    if _chain is None:
+        _chain = setup_chat()
+    return _chain
+
 def chat(query, history=None):
     """
     Chat with the faculty database using RAG with streaming
     """
-    conversation_chain = setup_chat()
-    result = conversation_chain.invoke({"question": query})
+    result = get_chain().invoke({"question": query})
     return result["answer"]
 
 if __name__ == "__main__":
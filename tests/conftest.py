@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# The scrapers import each other as top-level modules (e.g. `import profile_scraper`)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, 'src', 'scraper'), os.path.join(ROOT, 'src')]
+
+
+class LocalServer:
+    """
+    HTTP server on localhost that answers every GET with `respond(path, headers)`,
+    which returns (status, headers, body). Requests are recorded as (time, path, headers).
+    """
+
+    def __init__(self, respond):
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append((time.monotonic(), self.path, dict(self.headers)))
+                status, headers, body = respond(self.path, self.headers)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def http_server():
+    """Start local servers with `http_server(respond)`; they are shut down after the test."""
+    servers = []
+
+    def start(respond):
+        server = LocalServer(respond)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_path(tmp_path, monkeypatch):
+    # The page and profile caches are created relative to the working directory
+    monkeypatch.chdir(tmp_path)
@@ -0,0 +1,57 @@
+import asyncio
+
+from faculty_scraper import FacultyScraper
+
+
+def versioned_page(etag=None):
+    """Respond with a page whose version increases on every full (200) response."""
+    version = 0
+
+    def respond(path, headers):
+        nonlocal version
+        if etag and headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, b''
+        version += 1
+        page = f'<html><body><p>version {version}</p></body></html>'.encode()
+        return 200, ({'ETag': etag} if etag else {}), page
+
+    return respond
+
+
+def test_fetch_serves_cached_page_on_304(http_server):
+    server = http_server(versioned_page(etag='"v1"'))
+    scraper = FacultyScraper(server.url + '/', delay=0)
+    url = server.url + '/profile'
+
+    first = asyncio.run(scraper._fetch_all([url], 4))[url]
+    second = asyncio.run(scraper._fetch_all([url], 4))[url]
+
+    assert b'version 2' in first  # version 1 was the listing page fetched in __init__
+    assert second == first
+    profile_requests = [headers for _, path, headers in server.requests if path == '/profile']
+    assert 'If-None-Match' not in profile_requests[0]
+    assert profile_requests[1]['If-None-Match'] == '"v1"'
+
+
+def test_fetch_without_validators_gets_fresh_page(http_server):
+    server = http_server(versioned_page())
+    scraper = FacultyScraper(server.url + '/', delay=0)
+    url = server.url + '/profile'
+
+    first = asyncio.run(scraper._fetch_all([url], 4))[url]
+    second = asyncio.run(scraper._fetch_all([url], 4))[url]
+
+    assert b'version 2' in first
+    assert b'version 3' in second
+
+
+def test_listing_pages_are_fetched_fresh(http_server):
+    server = http_server(versioned_page())
+
+    first = FacultyScraper(server.url + '/', delay=0)
+    second = FacultyScraper(server.url + '/', delay=0)
+    page = second._fetch_page(server.url + '/')
+
+    assert 'version 1' in first.soup.get_text()
+    assert 'version 2' in second.soup.get_text()
+    assert 'version 3' in page.get_text()
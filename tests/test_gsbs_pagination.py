@@ -0,0 +1,79 @@
+import re
+
+import pytest
+
+from GSBS_faculty_scraper import GSBSFacultyScraper
+
+TOTAL_PAGES = 5
+
+
+def pager(n, style):
+    """Pagination links of page n in one of the layouts the scraper has to handle."""
+    if style == 'prev-next':
+        # Prev / "Page X of Y" / Next, as on the GSBS directory
+        links = f'<div class="small-4 cell"><a href="?page={n - 1}">Previous Page</a></div>' if n > 1 else ''
+        links += f'<div class="small-4 cell">Page {n} of {TOTAL_PAGES}</div>'
+        if n < TOTAL_PAGES:
+            links += f'<div class="small-4 cell"><a href="?page={n + 1}">Next Page</a></div>'
+        return links
+    if style == 'last':
+        if n < TOTAL_PAGES:
+            return f'<a href="?page={n + 1}">Next Page</a><a href="?page={TOTAL_PAGES}">Last</a>'
+        return ''
+    if style == 'truncated':
+        # Only the neighbouring page numbers are shown
+        links = ''.join(
+            f'<a href="?page={k}">{k}</a>'
+            for k in range(max(1, n - 2), min(TOTAL_PAGES, n + 2) + 1) if k != n
+        )
+        if n < TOTAL_PAGES:
+            links += f'<a href="?page={n + 1}">Next Page</a>'
+        return links
+    if style == 'zero-based':
+        # ?page=0 is the first page, so page n is ?page=n-1
+        return f'<a href="?page={n}">Next Page</a>' if n < TOTAL_PAGES else ''
+    raise ValueError(style)
+
+
+def directory(style):
+    def respond(path, headers):
+        if path.startswith('/p/'):
+            return 200, {}, f'<html><body><p>Profile {path[3:]}</p></body></html>'.encode()
+        match = re.search(r'page=(\d+)', path)
+        n = int(match.group(1)) if match else 1
+        if match and style == 'zero-based':
+            n += 1
+        body = (
+            f'<a class="cell callout grid-x" href="/p/{n}"><span class="name"><strong>F{n}</strong></span></a>'
+            + pager(n, style)
+        )
+        return 200, {}, f'<html><body>{body}</body></html>'.encode()
+    return respond
+
+
+@pytest.mark.parametrize('style', ['prev-next', 'last', 'truncated', 'zero-based'])
+def test_scrapes_every_page(http_server, style):
+    server = http_server(directory(style))
+    scraper = GSBSFacultyScraper(server.url + '/directory/', delay=0)
+
+    faculty_list = scraper.scrape_faculty_list()
+
+    assert [faculty.name for faculty in faculty_list] == [f'F{n}' for n in range(1, TOTAL_PAGES + 1)]
+    assert all(faculty.profile for faculty in faculty_list)
+
+
+@pytest.mark.parametrize('style, expected_pages', [
+    # Next Page -> ?page=2 alone does not tell where the directory ends
+    ('prev-next', []),
+    ('last', [2, 3, 4, 5]),
+    ('truncated', [2, 3]),
+    # Page numbers that do not start at 1 cannot be generated
+    ('zero-based', []),
+])
+def test_page_urls_only_cover_known_pages(http_server, style, expected_pages):
+    server = http_server(directory(style))
+    scraper = GSBSFacultyScraper(server.url + '/directory/', delay=0)
+
+    page_urls = scraper._get_page_urls()
+
+    assert page_urls == [f'{server.url}/directory/?page={n}' for n in expected_pages]
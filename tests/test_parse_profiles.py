@@ -0,0 +1,67 @@
+import shutil
+
+import profile_scraper
+from faculty_scraper import FacultyScraper
+
+PROFILE = b'''<html><head><title>Jane Doe</title></head><body>
+<nav><a href="/home">Home</a></nav>
+<div class="menu">Menu</div>
+<p>  Professor of Epidemiology  </p>
+
+<p>Studies infectious disease.</p>
+<a href="https://pubmed.ncbi.nlm.nih.gov/?term=doe">PubMed</a>
+<a href="https://janedoe.org" title="Personal website">Jane</a>
+<script>var x = 1;</script>
+</body></html>'''
+
+
+def test_parse_profile_html():
+    profile = profile_scraper.parse_profile_html('https://sph.uth.edu/p', PROFILE)
+
+    assert profile['title'] == 'Jane Doe'
+    assert profile['content'] == 'Professor of Epidemiology\nStudies infectious disease.\nPubMed\nJane'
+    assert profile['links'] == {
+        'pubmed': 'https://pubmed.ncbi.nlm.nih.gov/?term=doe',
+        'website': 'https://janedoe.org',
+    }
+
+
+def test_cached_profile_is_reparsed_after_parser_version_change(monkeypatch):
+    url = 'https://sph.uth.edu/p'
+    first = profile_scraper.parse_profile_html(url, PROFILE)
+
+    # Simulate a change to the parser
+    monkeypatch.setattr(profile_scraper, '_extract_links', lambda tree: {'website': 'changed'})
+    assert profile_scraper.parse_profile_html(url, PROFILE) == first
+
+    monkeypatch.setattr(profile_scraper, 'PARSER_VERSION', profile_scraper.PARSER_VERSION + '-next')
+    assert profile_scraper.parse_profile_html(url, PROFILE)['links'] == {'website': 'changed'}
+
+
+def test_cached_profile_is_reparsed_when_page_changes():
+    url = 'https://sph.uth.edu/p'
+    profile_scraper.parse_profile_html(url, PROFILE)
+
+    changed = profile_scraper.parse_profile_html(url, PROFILE.replace(b'Epidemiology', b'Biostatistics'))
+
+    assert 'Professor of Biostatistics' in changed['content']
+
+
+def test_parse_profiles_in_process_and_in_pool_agree(http_server):
+    server = http_server(lambda path, headers: (200, {}, b'<html><body></body></html>'))
+    scraper = FacultyScraper(server.url + '/', delay=0)
+    pages = {
+        'https://sph.uth.edu/a': PROFILE,
+        'https://sph.uth.edu/b': PROFILE.replace(b'Jane Doe', b'John Roe'),
+        'https://sph.uth.edu/c': None,
+    }
+
+    in_process = scraper._parse_profiles(pages)
+    # Parse again from scratch rather than from the profile cache
+    shutil.rmtree(profile_scraper.PROFILE_CACHE_DIR)
+    scraper.min_pool_pages = 1
+    in_pool = scraper._parse_profiles(pages)
+
+    assert in_process == in_pool
+    assert set(in_process) == {'https://sph.uth.edu/a', 'https://sph.uth.edu/b'}
+    assert in_process['https://sph.uth.edu/b']['title'] == 'John Roe'
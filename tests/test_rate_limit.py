@@ -0,0 +1,43 @@
+import asyncio
+
+from faculty_scraper import FacultyScraper
+
+DELAY = 0.3
+
+
+def page(path, headers):
+    return 200, {}, b'<html><body>profile</body></html>'
+
+
+def profile_request_times(server):
+    return [t for t, path, _ in server.requests if path.startswith('/p')]
+
+
+def test_requests_are_spaced_per_host(http_server):
+    host_a = http_server(page)
+    host_b = http_server(page)
+    scraper = FacultyScraper(host_a.url + '/', delay=DELAY)
+    urls = [host_a.url + '/p1', host_a.url + '/p2', host_b.url + '/p1', host_b.url + '/p2']
+
+    pages = asyncio.run(scraper._fetch_all(urls, 8))
+
+    assert all(pages.values())
+    a_times = profile_request_times(host_a)
+    b_times = profile_request_times(host_b)
+    # Requests to the same host wait for the delay...
+    assert a_times[1] - a_times[0] >= DELAY * 0.8
+    assert b_times[1] - b_times[0] >= DELAY * 0.8
+    # ...but a different host does not wait on them
+    assert abs(b_times[0] - a_times[0]) < DELAY / 2
+
+
+def test_no_delay_disables_limiting(http_server):
+    server = http_server(page)
+    scraper = FacultyScraper(server.url + '/', delay=0)
+    urls = [server.url + f'/p{i}' for i in range(4)]
+
+    pages = asyncio.run(scraper._fetch_all(urls, 8))
+
+    assert all(pages.values())
+    times = profile_request_times(server)
+    assert max(times) - min(times) < DELAY